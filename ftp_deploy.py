@@ -12,6 +12,8 @@ FTP_PORT = int(os.getenv('FTP_PORT', '21'))
 REMOTE_DIR = os.getenv('REMOTE_DIR', '/public_html')
 LOCAL_DIR = Path(os.getenv('LOCAL_DIR', 'dist'))
 
+ASSET_REF_RE = re.compile(r'(?:src|href)="([^"]+)"')
+
 
 def require_runtime_config() -> None:
   missing = [
@@ -36,37 +38,70 @@ def remote_join(*parts: str) -> str:
   return '/' + '/'.join(cleaned)
 
 
-def ensure_remote_dir(ftp: ftplib.FTP, remote_dir: str) -> None:
+def remote_dir_exists(ftp: ftplib.FTP, remote_dir: str) -> bool:
+  current = ftp.pwd()
+  try:
+    ftp.cwd(remote_dir)
+  except ftplib.error_perm:
+    return False
+  ftp.cwd(current)
+  return True
+
+
+def ensure_remote_dir(ftp: ftplib.FTP, remote_dir: str, created_dirs: set[str]) -> None:
   path = ''
   for chunk in remote_dir.strip('/').split('/'):
     path = f'{path}/{chunk}' if path else f'/{chunk}'
+    # Each file upload walks its full ancestry, so skip directories this
+    # deploy has already created or confirmed instead of re-issuing MKD.
+    if path in created_dirs:
+      continue
     try:
       ftp.mkd(path)
     except ftplib.error_perm:
-      # Directory already exists.
-      pass
+      # MKD fails the same way for "already exists" and "permission denied",
+      # so only remember the path once the server confirms it is a directory.
+      if not remote_dir_exists(ftp, path):
+        continue
+    created_dirs.add(path)
 
 
-def upload_file(ftp: ftplib.FTP, local_file: Path, remote_file: str) -> None:
-  ensure_remote_dir(ftp, str(Path(remote_file).parent).replace('\\', '/'))
+def upload_file(
+  ftp: ftplib.FTP,
+  local_file: Path,
+  remote_file: str,
+  created_dirs: set[str],
+) -> None:
+  ensure_remote_dir(ftp, str(Path(remote_file).parent).replace('\\', '/'), created_dirs)
   print(f'Uploading: {local_file} -> {remote_file}')
   with local_file.open('rb') as handle:
     ftp.storbinary(f'STOR {remote_file}', handle)
 
 
-def upload_directory(ftp: ftplib.FTP, local_dir: Path, remote_dir: str) -> None:
-  ensure_remote_dir(ftp, remote_dir)
-  for item in sorted(local_dir.iterdir(), key=lambda p: p.name):
-    remote_item = remote_join(remote_dir, item.name)
-    if item.is_dir():
-      upload_directory(ftp, item, remote_item)
+def sorted_entries(local_dir: Path) -> list[os.DirEntry]:
+  # scandir carries each entry's type, so is_dir() needs no extra stat call.
+  with os.scandir(local_dir) as it:
+    return sorted(it, key=lambda e: e.name)
+
+
+def upload_directory(
+  ftp: ftplib.FTP,
+  local_dir: Path,
+  remote_dir: str,
+  created_dirs: set[str],
+) -> None:
+  ensure_remote_dir(ftp, remote_dir, created_dirs)
+  for entry in sorted_entries(local_dir):
+    remote_item = remote_join(remote_dir, entry.name)
+    if entry.is_dir():
+      upload_directory(ftp, Path(entry.path), remote_item, created_dirs)
     else:
-      upload_file(ftp, item, remote_item)
+      upload_file(ftp, Path(entry.path), remote_item, created_dirs)
 
 
 def parse_local_asset_references(index_html: Path) -> set[str]:
   html = index_html.read_text(encoding='utf-8')
-  refs = set(re.findall(r'(?:src|href)="([^"]+)"', html))
+  refs = set(ASSET_REF_RE.findall(html))
   absolute_refs = {
     ref
     for ref in refs
@@ -89,25 +124,37 @@ def parse_local_asset_references(index_html: Path) -> set[str]:
   return verify_refs
 
 
-def remote_file_exists(ftp: ftplib.FTP, remote_path: str) -> bool:
-  parent = str(Path(remote_path).parent).replace('\\', '/')
-  name = Path(remote_path).name
-
+def list_remote_dir(ftp: ftplib.FTP, remote_dir: str) -> set[str]:
   try:
-    entries = ftp.nlst(parent)
+    entries = ftp.nlst(remote_dir)
   except ftplib.error_perm:
-    return False
+    return set()
+
+  return {entry.split('/')[-1] for entry in entries}
+
+
+def remote_file_exists(
+  ftp: ftplib.FTP,
+  remote_path: str,
+  listings: dict[str, set[str]],
+) -> bool:
+  parent = str(Path(remote_path).parent).replace('\\', '/')
+  name = Path(remote_path).name
 
-  normalized = {entry.split('/')[-1] for entry in entries}
-  return name in normalized
+  # Most references share a handful of directories (e.g. /assets), so list
+  # each one once instead of issuing an NLST round-trip per reference.
+  if parent not in listings:
+    listings[parent] = list_remote_dir(ftp, parent)
+  return name in listings[parent]
 
 
 def verify_referenced_assets(ftp: ftplib.FTP, references: Iterable[str]) -> None:
   missing: list[str] = []
+  listings: dict[str, set[str]] = {}
 
   for reference in sorted(references):
     remote_path = remote_join(REMOTE_DIR, reference)
-    if not remote_file_exists(ftp, remote_path):
+    if not remote_file_exists(ftp, remote_path, listings):
       missing.append(reference)
 
   if missing:
@@ -122,6 +169,7 @@ def deploy() -> None:
     raise RuntimeError(f'Expected build artifact missing: {index_html}')
 
   references = parse_local_asset_references(index_html)
+  created_dirs: set[str] = set()
 
   ftp = ftplib.FTP()
   print(f'Connecting to {FTP_HOST}:{FTP_PORT}')
@@ -135,21 +183,21 @@ def deploy() -> None:
     assets_dir = LOCAL_DIR / 'assets'
     if assets_dir.exists():
       print('Uploading assets directory first...')
-      upload_directory(ftp, assets_dir, remote_join(REMOTE_DIR, 'assets'))
+      upload_directory(ftp, assets_dir, remote_join(REMOTE_DIR, 'assets'), created_dirs)
 
     print('Uploading non-index static files...')
-    for item in sorted(LOCAL_DIR.iterdir(), key=lambda p: p.name):
-      if item.name in {'index.html', 'assets'}:
+    for entry in sorted_entries(LOCAL_DIR):
+      if entry.name in {'index.html', 'assets'}:
         continue
 
-      remote_item = remote_join(REMOTE_DIR, item.name)
-      if item.is_dir():
-        upload_directory(ftp, item, remote_item)
+      remote_item = remote_join(REMOTE_DIR, entry.name)
+      if entry.is_dir():
+        upload_directory(ftp, Path(entry.path), remote_item, created_dirs)
       else:
-        upload_file(ftp, item, remote_item)
+        upload_file(ftp, Path(entry.path), remote_item, created_dirs)
 
     print('Uploading index.html last...')
-    upload_file(ftp, index_html, remote_join(REMOTE_DIR, 'index.html'))
+    upload_file(ftp, index_html, remote_join(REMOTE_DIR, 'index.html'), created_dirs)
 
     print('Verifying index.html references exist remotely...')
     verify_referenced_assets(ftp, references)
@@ -8,12 +8,11 @@ import os
 import sys
 import json
 import argparse
-import subprocess
 
 
 def create_file(path, content):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, 'w') as f:
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
         f.write(content)
     print(f"  ✅ {os.path.relpath(path)}")
 